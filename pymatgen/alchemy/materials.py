@@ -17,7 +17,6 @@ __email__ = "shyuep@gmail.com"
 __date__ = "Mar 2, 2012"
 
 import os
-import re
 import json
 import datetime
 from copy import deepcopy
@@ -32,9 +31,28 @@ from pymatgen.matproj.snl import StructureNL
 
 from warnings import warn
 
+try:
+    # orjson is considerably faster than the stdlib json for serializing the
+    # large nested dicts produced by as_dict.
+    import orjson
+except ImportError:
+    orjson = None
+
 dec = MontyDecoder()
 
 
+def _json_dumps(obj):
+    """
+    Serializes obj to UTF-8 encoded JSON bytes, using orjson if available.
+    Like json.dumps, numpy scalars (e.g., energies in the output_parameters
+    of one-to-many transformations) and non-string keys are supported.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY |
+                            orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
+
+
 class TransformedStructure(PMGSONable):
     """
     Container object for new structures that include history of
@@ -120,41 +138,57 @@ class TransformedStructure(PMGSONable):
                 history of undoing. However, when using append_transformation
                 to do a redo, the redo list should not be cleared to allow
                 multiple redos.
+
+        Returns:
+            List of alternative TransformedStructures if return_alternatives
+            is set and the transformation is one-to-many. None otherwise.
         """
         if clear_redo:
             self._undone = []
 
+        structure = self.final_structure
         if return_alternatives and transformation.is_one_to_many:
             ranked_list = transformation.apply_transformation(
-                self.final_structure, return_ranked_list=return_alternatives)
+                structure, return_ranked_list=return_alternatives)
 
-            input_structure = self.final_structure.as_dict()
+            input_structure = structure.as_dict()
+            history = self.history
+            # Most one-to-many transformations report themselves as the
+            # actual transformation, so their dict is only built once.
+            tdict = transformation.as_dict()
             alts = []
             for x in ranked_list[1:]:
                 s = x.pop("structure")
                 actual_transformation = x.pop("transformation", transformation)
-                hdict = actual_transformation.as_dict()
+                if actual_transformation is transformation:
+                    hdict = dict(tdict)
+                else:
+                    hdict = actual_transformation.as_dict()
                 hdict["input_structure"] = input_structure
                 hdict["output_parameters"] = x
-                self.final_structure = s
-                d = self.as_dict()
-                d['history'].append(hdict)
-                d['final_structure'] = s.as_dict()
-                alts.append(TransformedStructure.from_dict(d))
+                # Each alternative gets its own copy of the history, so that
+                # it can be modified independently of this one and of its
+                # siblings.
+                alts.append(TransformedStructure(
+                    s, history=deepcopy(history + [hdict]),
+                    other_parameters=deepcopy(self.other_parameters)))
 
             x = ranked_list[0]
             s = x.pop("structure")
             actual_transformation = x.pop("transformation", transformation)
-            hdict = actual_transformation.as_dict()
-            hdict["input_structure"] = self.final_structure.as_dict()
+            if actual_transformation is transformation:
+                hdict = tdict
+            else:
+                hdict = actual_transformation.as_dict()
+            hdict["input_structure"] = input_structure
             hdict["output_parameters"] = x
-            self.history.append(hdict)
+            history.append(hdict)
             self.final_structure = s
             return alts
         else:
-            s = transformation.apply_transformation(self.final_structure)
+            s = transformation.apply_transformation(structure)
             hdict = transformation.as_dict()
-            hdict["input_structure"] = self.final_structure.as_dict()
+            hdict["input_structure"] = structure.as_dict()
             hdict["output_parameters"] = {}
             self.history.append(hdict)
             self.final_structure = s
@@ -201,7 +235,8 @@ class TransformedStructure(PMGSONable):
         """
         d = vasp_input_set.get_all_vasp_input(self.final_structure,
                                               generate_potcar)
-        d["transformations.json"] = json.dumps(self.as_dict())
+        d["transformations.json"] = _json_dumps(self.as_dict()).decode(
+            "utf-8")
         return d
 
     def write_vasp_input(self, vasp_input_set, output_dir,
@@ -220,20 +255,21 @@ class TransformedStructure(PMGSONable):
         """
         vasp_input_set.write_input(self.final_structure, output_dir,
                                    make_dir_if_not_present=create_directory)
-        with open(os.path.join(output_dir, "transformations.json"), "w") as fp:
-            json.dump(self.as_dict(), fp)
+        data = _json_dumps(self.as_dict())
+        with open(os.path.join(output_dir, "transformations.json"),
+                  "wb") as fp:
+            fp.write(data)
 
     def __str__(self):
         output = ["Current structure", "------------",
                   str(self.final_structure),
                   "\nHistory",
                   "------------"]
-        for h in self.history:
-            h.pop('input_structure', None)
-            output.append(str(h))
-        output.append("\nOther parameters")
-        output.append("------------")
-        output.append(str(self.other_parameters))
+        output.extend(str({k: v for k, v in h.items()
+                           if k != 'input_structure'})
+                      for h in self.history)
+        output.extend(["\nOther parameters", "------------",
+                       str(self.other_parameters)])
         return "\n".join(output)
 
     def set_parameter(self, key, value):
@@ -247,7 +283,13 @@ class TransformedStructure(PMGSONable):
         is in the case of performing a substitution transformation on the
         structure when the specie to replace isn't in the structure.
         """
-        return not self.final_structure == self.structures[-2]
+        for h in reversed(self.history):
+            if "input_structure" in h:
+                s = h["input_structure"]
+                if isinstance(s, dict):
+                    s = Structure.from_dict(s)
+                return not self.final_structure == s
+        raise IndexError("No previous structure in history.")
 
     @property
     def structures(self):
@@ -257,7 +299,8 @@ class TransformedStructure(PMGSONable):
         """
         hstructs = [Structure.from_dict(s['input_structure'])
                     for s in self.history if 'input_structure' in s]
-        return hstructs + [self.final_structure]
+        hstructs.append(self.final_structure)
+        return hstructs
 
     @staticmethod
     def from_cif_string(cif_string, transformations=None, primitive=True,
@@ -284,11 +327,10 @@ class TransformedStructure(PMGSONable):
             TransformedStructure
         """
         parser = CifParser.from_string(cif_string, occupancy_tolerance)
-        raw_string = re.sub("'", "\"", cif_string)
+        raw_string = cif_string.replace("'", "\"")
         cif_dict = parser.as_dict()
-        cif_keys = list(cif_dict.keys())
         s = parser.get_structures(primitive)[0]
-        partial_cif = cif_dict[cif_keys[0]]
+        partial_cif = cif_dict[next(iter(cif_dict))]
         if "_database_code_ICSD" in partial_cif:
             source = partial_cif["_database_code_ICSD"] + "-ICSD"
         else:
@@ -296,7 +338,7 @@ class TransformedStructure(PMGSONable):
         source_info = {"source": source,
                        "datetime": str(datetime.datetime.now()),
                        "original_file": raw_string,
-                       "cif_data": cif_dict[cif_keys[0]]}
+                       "cif_data": partial_cif}
         return TransformedStructure(s, transformations, history=[source_info])
 
     @staticmethod
@@ -313,7 +355,7 @@ class TransformedStructure(PMGSONable):
         if not p.true_names:
             raise ValueError("Transformation can be craeted only from POSCAR "
                              "strings with proper VASP5 element symbols.")
-        raw_string = re.sub("'", "\"", poscar_string)
+        raw_string = poscar_string.replace("'", "\"")
         s = p.structure
         source_info = {"source": "POSCAR",
                        "datetime": str(datetime.datetime.now()),
@@ -349,7 +391,8 @@ class TransformedStructure(PMGSONable):
                  'during type conversion to SNL')
         hist = []
         for h in self.history:
-            snl_metadata = h.pop('_snl', {})
+            h = dict(h)
+            snl_metadata = dict(h.pop('_snl', {}))
             hist.append({'name' : snl_metadata.pop('name', 'pymatgen'),
                          'url' : snl_metadata.pop('url',
                                     'http://pypi.python.org/pypi/pymatgen'),
@@ -370,7 +413,7 @@ class TransformedStructure(PMGSONable):
         """
         hist = []
         for h in snl.history:
-            d = h.description
+            d = dict(h.description)
             d['_snl'] = {'url' : h.url, 'name' : h.name}
             hist.append(d)
         return cls(snl.structure, history=hist)
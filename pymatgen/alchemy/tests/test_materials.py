@@ -17,6 +17,8 @@ __date__ = "Mar 5, 2012"
 import unittest
 import os
 import json
+import shutil
+import tempfile
 import warnings
 
 from pymatgen.core.structure import Structure
@@ -25,7 +27,8 @@ from pymatgen.transformations.standard_transformations import \
     SupercellTransformation
 from pymatgen.io.vaspio_set import MPVaspInputSet
 from pymatgen.alchemy.filters import ContainsSpecieFilter
-from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.alchemy import materials
+from pymatgen.alchemy.materials import TransformedStructure, _json_dumps
 from pymatgen.matproj.snl import StructureNL
 
 test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..",
@@ -73,9 +76,7 @@ class TransformedStructureTest(unittest.TestCase):
                          self.trans.final_structure.composition
                          .reduced_formula)
         self.assertEqual(len(self.trans.structures), 3)
-        coords = list()
-        coords.append([0, 0, 0])
-        coords.append([0.75, 0.5, 0.75])
+        coords = [[0, 0, 0], [0.75, 0.5, 0.75]]
         lattice = [[3.8401979337, 0.00, 0.00],
                    [1.9200989668, 3.3257101909, 0.00],
                    [0.00, -2.2171384943, 3.1355090603]]
@@ -88,6 +89,22 @@ class TransformedStructureTest(unittest.TestCase):
                 'Si4+', 0.5,
                 algo=PartialRemoveSpecieTransformation.ALGO_COMPLETE), 5)
         self.assertEqual(len(alt), 2)
+        self.assertEqual(len(ts.history[-1]["input_structure"]["sites"]), 4)
+        for a in alt:
+            self.assertEqual(len(a.history), 2)
+            self.assertEqual(len(a.final_structure), 2)
+            for h, h_alt in zip(ts.history, a.history):
+                self.assertIsNot(h_alt, h)
+                self.assertIsNot(h_alt["input_structure"],
+                                 h["input_structure"])
+        self.assertIsNot(alt[0].history[-1]["input_structure"],
+                         alt[1].history[-1]["input_structure"])
+
+    def test_was_modified(self):
+        self.assertTrue(self.trans.was_modified)
+        self.trans.append_transformation(
+            SubstitutionTransformation({"Mn": "Co"}))
+        self.assertFalse(self.trans.was_modified)
 
     def test_append_filter(self):
         f3 = ContainsSpecieFilter(['O2-'], strict_compare=True, AND=False)
@@ -142,6 +159,13 @@ class TransformedStructureTest(unittest.TestCase):
         ts.undo_last_change()
         ts.redo_next_change()
 
+    def test_str(self):
+        s = str(self.trans)
+        self.assertIn("Reduced Formula: NaFePO4", s)
+        self.assertIn("SubstitutionTransformation", s)
+        self.assertNotIn("input_structure", s)
+        self.assertIn("input_structure", self.trans.history[-1])
+
     def test_as_dict(self):
         self.trans.set_parameter('author', 'will')
         d = self.trans.as_dict()
@@ -150,7 +174,81 @@ class TransformedStructureTest(unittest.TestCase):
         self.assertIn('version', d)
         self.assertIn('author', d['other_parameters'])
         self.assertEqual(Structure.from_dict(d).formula, 'Na4 Fe4 P4 O16')
-        
+
+    def test_as_dict_history_copy(self):
+        d = self.trans.as_dict()
+        d['history'][-1].pop('output_parameters')
+        del d['history'][-1]['input_structure']['sites'][:]
+        d['history'][-1]['input_structure']['lattice']['a'] = 0
+        del d['history'][-1]['init_args']['species_map'][:]
+        d = self.trans.as_dict()
+        h = d['history'][-1]
+        self.assertIn('output_parameters', h)
+        self.assertEqual(len(h['input_structure']['sites']), 28)
+        self.assertNotEqual(h['input_structure']['lattice']['a'], 0)
+        self.assertEqual(h['init_args']['species_map'], [("Li", "Na")])
+
+    def _get_alternatives_ts(self):
+        # The history of this TransformedStructure holds numpy scalars in
+        # the output_parameters of the one-to-many transformation.
+        coords = [[0, 0, 0], [0.75, 0.5, 0.75]]
+        lattice = [[3.8401979337, 0.00, 0.00],
+                   [1.9200989668, 3.3257101909, 0.00],
+                   [0.00, -2.2171384943, 3.1355090603]]
+        struct = Structure(lattice, ["Si4+", "Si4+"], coords)
+        ts = TransformedStructure(
+            struct, [SupercellTransformation.from_scaling_factors(2, 1, 1)])
+        ts.append_transformation(
+            PartialRemoveSpecieTransformation(
+                'Si4+', 0.5,
+                algo=PartialRemoveSpecieTransformation.ALGO_COMPLETE), 5)
+        return ts
+
+    def _call_without_orjson(self, func, *args):
+        orjson = materials.orjson
+        materials.orjson = None
+        try:
+            return func(*args)
+        finally:
+            materials.orjson = orjson
+
+    def _check_json(self, ts, json_str):
+        d = json.loads(json_str)
+        ts_json = TransformedStructure.from_dict(d)
+        self.assertEqual(ts_json.final_structure, ts.final_structure)
+        self.assertEqual(len(ts_json.history), len(ts.history))
+        self.assertAlmostEqual(
+            d["history"][-1]["output_parameters"]["energy"],
+            float(ts.history[-1]["output_parameters"]["energy"]))
+        return d
+
+    def test_json_dumps(self):
+        ts = self._get_alternatives_ts()
+        d = ts.as_dict()
+        d_stdlib = self._check_json(
+            ts, self._call_without_orjson(_json_dumps, d).decode("utf-8"))
+        if materials.orjson is not None:
+            self.assertEqual(
+                self._check_json(ts, _json_dumps(d).decode("utf-8")),
+                d_stdlib)
+
+    def test_write_vasp_input(self):
+        if "VASP_PSP_DIR" not in os.environ:
+            os.environ["VASP_PSP_DIR"] = test_dir
+        ts = self._get_alternatives_ts()
+        output_dir = tempfile.mkdtemp()
+        json_file = os.path.join(output_dir, "transformations.json")
+        try:
+            ts.write_vasp_input(MPVaspInputSet(), output_dir)
+            with open(json_file) as f:
+                self._check_json(ts, f.read())
+            self._call_without_orjson(ts.write_vasp_input, MPVaspInputSet(),
+                                      output_dir)
+            with open(json_file) as f:
+                self._check_json(ts, f.read())
+        finally:
+            shutil.rmtree(output_dir)
+
     def test_snl(self):
         self.trans.set_parameter('author', 'will')
         with warnings.catch_warnings(record=True) as w:
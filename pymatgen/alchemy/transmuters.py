@@ -12,7 +12,7 @@ It also includes the helper function, batch_write_vasp_input to generate an
 entire directory of vasp input files for running.
 """
 
-from six.moves import filter, map
+from six.moves import filter
 
 __author__ = "Shyue Ping Ong, Will Richards"
 __copyright__ = "Copyright 2012, The Materials Project"
@@ -22,11 +22,11 @@ __email__ = "shyuep@gmail.com"
 __date__ = "Mar 4, 2012"
 
 import os
-import re
 import warnings
 
 from multiprocessing import Pool
 from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.io.cifio import CifWriter
 
 
 class StandardTransmuter(object):
@@ -131,12 +131,15 @@ class StandardTransmuter(object):
             structure
         """
         if self.ncores and transformation.use_multiprocessing:
-            p = Pool(self.ncores)
             #need to condense arguments into single tuple to use map
-            z = map(
-                lambda x: (x, transformation, extend_collection, clear_redo),
-                self.transformed_structures)
-            new_tstructs = p.map(_apply_transformation, z, 1)
+            z = [(x, transformation, extend_collection, clear_redo)
+                 for x in self.transformed_structures]
+            p = Pool(self.ncores)
+            try:
+                new_tstructs = p.map(_apply_transformation, z, 1)
+            finally:
+                p.close()
+                p.join()
             self.transformed_structures = []
             for ts in new_tstructs:
                 self.transformed_structures.extend(ts)
@@ -146,7 +149,7 @@ class StandardTransmuter(object):
                 new = x.append_transformation(transformation,
                                               extend_collection,
                                               clear_redo=clear_redo)
-                if new is not None:
+                if new:
                     new_structures.extend(new)
             self.transformed_structures.extend(new_structures)
 
@@ -295,7 +298,7 @@ class CifTransmuter(StandardTransmuter):
         structure_data = []
         read_data = False
         for line in lines:
-            if re.match("^\s*data", line):
+            if line.lstrip().startswith("data"):
                 structure_data.append([])
                 read_data = True
             if read_data:
@@ -395,7 +398,7 @@ def batch_write_vasp_input(transformed_structures, vasp_input_set, output_dir,
             programs.
     """
     for i, s in enumerate(transformed_structures):
-        formula = re.sub("\s+", "", s.final_structure.formula)
+        formula = "".join(s.final_structure.formula.split())
         if subfolder is not None:
             subdir = subfolder(s)
             dirname = os.path.join(output_dir, subdir,
@@ -405,8 +408,6 @@ def batch_write_vasp_input(transformed_structures, vasp_input_set, output_dir,
         s.write_vasp_input(vasp_input_set, dirname,
                            create_directory=create_directory)
         if include_cif:
-            from pymatgen.io.cifio import CifWriter
-
             writer = CifWriter(s.final_structure)
             writer.write_file(os.path.join(dirname, "{}.cif".format(formula)))
 
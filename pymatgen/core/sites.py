@@ -474,6 +474,18 @@ class PeriodicSite(Site, PMGSONable):
         """
         Json-serializable dict representation of PeriodicSite.
         """
+        d = self._get_site_dict()
+        d["lattice"] = self._lattice.as_dict()
+        d["@module"] = self.__class__.__module__
+        d["@class"] = self.__class__.__name__
+        return d
+
+    def _get_site_dict(self):
+        """
+        Dict representation of the site without the lattice. Used by
+        IStructure.as_dict so that the lattice shared by all sites is not
+        serialized once per site.
+        """
         species_list = []
         for spec, occu in self._species.items():
             d = spec.as_dict()
@@ -484,10 +496,7 @@ class PeriodicSite(Site, PMGSONable):
         return {"label": self.species_string, "species": species_list,
                 "xyz": [float(c) for c in self._coords],
                 "abc": [float(c) for c in self._fcoords],
-                "lattice": self._lattice.as_dict(),
-                "properties": self._properties,
-                "@module": self.__class__.__module__,
-                "@class": self.__class__.__name__}
+                "properties": self._properties}
 
     @classmethod
     def from_dict(cls, d, lattice=None):
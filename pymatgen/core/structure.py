@@ -1116,13 +1116,8 @@ class IStructure(SiteCollection, PMGSONable):
 
         d = {"@module": self.__class__.__module__,
              "@class": self.__class__.__name__,
-             "lattice": latt_dict, "sites": []}
-        for site in self:
-            site_dict = site.as_dict()
-            del site_dict["lattice"]
-            del site_dict["@module"]
-            del site_dict["@class"]
-            d["sites"].append(site_dict)
+             "lattice": latt_dict,
+             "sites": [site._get_site_dict() for site in self]}
         return d
 
     @classmethod
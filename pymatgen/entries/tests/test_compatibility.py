@@ -17,6 +17,8 @@ __date__ = "Mar 19, 2012"
 import os
 import unittest
 
+from monty.functools import lru_cache
+
 from pymatgen.entries.compatibility import MaterialsProjectCompatibility, \
     MITCompatibility, AqueousCorrection, MITAqueousCompatibility, MaterialsProjectAqueousCompatibility
 from pymatgen.entries.computed_entries import ComputedEntry, \
@@ -24,465 +26,369 @@ from pymatgen.entries.computed_entries import ComputedEntry, \
 from pymatgen import Composition, Lattice, Structure, Element
 
 
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_MIT_YAML = os.path.join(_MODULE_DIR, os.path.pardir, "MITCompatibility.yaml")
+
+# All module-level fixtures below are treated as read-only. Together with
+# _multiprocess_can_split_ on the test classes, this allows the tests to be
+# distributed across processes, e.g. with nosetests --processes=4.
+
+# Shared POTCAR symbols and parameter templates. Entries are built from a
+# copy of a template with _entry, so that tests modifying entry.parameters
+# do not affect each other.
+_PSP_FE_PV_O = ('PAW_PBE Fe_pv 06Sep2000', 'PAW_PBE O 08Apr2002')
+_PSP_FE_PV_F = ('PAW_PBE Fe_pv 06Sep2000', 'PAW_PBE F 08Apr2002')
+_PSP_FE_PV_S = ('PAW_PBE Fe_pv 06Sep2000', 'PAW_PBE S 08Apr2002')
+_PSP_FE_O = ('PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002')
+_PSP_FE_F = ('PAW_PBE Fe 06Sep2000', 'PAW_PBE F 08Apr2002')
+_PSP_FE_S = ('PAW_PBE Fe 06Sep2000', 'PAW_PBE S 08Apr2002')
+_PSP_AL_O = ('PAW_PBE Al 06Sep2000', 'PAW_PBE O 08Apr2002')
+_PSP_O = ('PAW_PBE O 08Apr2002',)
+_PSP_FE_O_H = ('PAW_PBE Fe 17Jan2003', 'PAW_PBE O 08Apr2002',
+               'PAW_PBE H 15Jun2001')
+
+_MP_GGA_U_FE_O = {'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'O': 0},
+                  'run_type': 'GGA+U', 'potcar_symbols': _PSP_FE_PV_O}
+_MP_GGA_FE_O = {'is_hubbard': False, 'hubbards': {}, 'run_type': 'GGA',
+                'potcar_symbols': _PSP_FE_PV_O}
+_MIT_GGA_U_FE_O = {'is_hubbard': True, 'hubbards': {'Fe': 4.0, 'O': 0},
+                   'run_type': 'GGA+U', 'potcar_symbols': _PSP_FE_O}
+_MIT_GGA_FE_O = {'is_hubbard': False, 'hubbards': None, 'run_type': 'GGA',
+                 'potcar_symbols': _PSP_FE_O}
+_GGA_O = {'is_hubbard': False, 'hubbards': {}, 'run_type': 'GGA',
+          'potcar_symbols': _PSP_O}
+
+
+def _entry(formula, energy=-1, template=_MP_GGA_U_FE_O, **overrides):
+    """
+    Returns a ComputedEntry with a fresh copy of the template parameters,
+    updated with any overrides.
+    """
+    parameters = dict(template, **overrides)
+    if parameters.get("hubbards"):
+        parameters["hubbards"] = dict(parameters["hubbards"])
+    return ComputedEntry(formula, energy, 0.0, parameters=parameters)
+
+
+# Expected Fe2O3 corrections and corrected energies of the Li-O entries,
+# which are all given an uncorrected energy of -3 eV.
+_MP_FE2O3_CORR = -2.733 * 2 - 0.70229 * 3
+_MIT_FE2O3_CORR = -1.723 * 2 - 0.66975 * 3
+_LIO2_ENERGY = -3 - 0.13893 * 4
+_LI2O2_ENERGY = -3 - 0.44317 * 4
+_LI2O_ENERGY = -3.0 - 0.66975
+# Without the peroxide correction, peroxides and ozonides get the oxide one.
+_LI2O2_OXIDE_ENERGY = -3 - 0.66975 * 4
+_LIO3_OXIDE_ENERGY = -3.0 - 3 * 0.66975
+
+
+@lru_cache(maxsize=128)
+def _comp(formula):
+    # Composition is immutable, so parsed formulas can be shared.
+    return Composition(formula)
+
+
+_EL_LI, _EL_O, _EL_H = Element("Li"), Element("O"), Element("H")
+_ELTS_LIO2 = (_EL_LI,) * 2 + (_EL_O,) * 4
+_ELTS_LI2O2 = (_EL_LI,) * 4 + (_EL_O,) * 4
+_ELTS_LIO3 = (_EL_LI,) + (_EL_O,) * 3
+_ELTS_LI2O = (_EL_LI, _EL_LI, _EL_O)
+_ELTS_LIOH = (_EL_H, _EL_H, _EL_LI, _EL_LI, _EL_O, _EL_O)
+
+# Structure shared by the aqueous tests. Like the oxide structures in
+# _OxideStructsMixin, it is only read by ComputedStructureEntry and the
+# compatibility schemes, so each lattice is computed once per process.
+_LIOH_STRUCT = Structure(
+    Lattice.from_parameters(3.565276, 3.565276, 4.384277, 90, 90, 90),
+    _ELTS_LIOH,
+    [[0.000000, 0.500000, 0.413969],
+     [0.500000, 0.000000, 0.586031],
+     [0.000000, 0.000000, 0.000000],
+     [0.500000, 0.500000, 0.000000],
+     [0.000000, 0.500000, 0.192672],
+     [0.500000, 0.000000, 0.807328]])
+
+
 class MaterialsProjectCompatibilityTest(unittest.TestCase):
 
-    def setUp(self):
-        self.entry1 = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.entry2 = ComputedEntry(
-            'Fe3O4', -2, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.entry3 = ComputedEntry(
-            'FeO', -2, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 4.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-    def test_process_entry(self):
-        compat = MaterialsProjectCompatibility()
-        ggacompat = MaterialsProjectCompatibility("GGA")
+    _multiprocess_can_split_ = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compat = MaterialsProjectCompatibility()
+        cls.ggacompat = MaterialsProjectCompatibility("GGA")
+        cls.entry1 = _entry('Fe2O3', -1)
+        cls.entry2 = _entry('Fe3O4', -2)
+        cls.entry3 = _entry('FeO', -2, hubbards={'Fe': 4.3, 'O': 0})
 
+    def test_process_entry(self):
         #Correct parameters
-        self.assertIsNotNone(compat.process_entry(self.entry1))
-        self.assertIsNone(ggacompat.process_entry(self.entry1))
+        self.assertIsNotNone(self.compat.process_entry(self.entry1))
+        self.assertIsNone(self.ggacompat.process_entry(self.entry1))
 
         #Correct parameters
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': False, "hubbards": {}, 'run_type': 'GGA',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-        self.assertIsNotNone(ggacompat.process_entry(entry))
-
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNotNone(compat.process_entry(entry))
-
-        #Check actual correction
-        self.assertAlmostEqual(compat.process_entry(entry).correction,
-                               - 2.733 * 2 - 0.70229 * 3)
-
-        entry = ComputedEntry(
-            'FeF3', -2, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'F': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE F 08Apr2002']})
-        self.assertIsNotNone(compat.process_entry(entry))
-
-        #Check actual correction
-        self.assertAlmostEqual(compat.process_entry(entry).correction, -2.733)
-
-        #Wrong U value
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True,
-                        'hubbards': {'Fe': 5.2, 'O': 0}, 'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-
-        #GGA run of U
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': False, 'hubbards': None,
-                        'run_type': 'GGA',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-
-        #GGA+U run of non-U
-        entry = ComputedEntry(
-            'Al2O3', -1, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Al': 5.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Al 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-
-        #Materials project should not have a U for sulfides
-        entry = ComputedEntry(
-            'FeS2', -2, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'S': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE S 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-
-        #Wrong psp
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
+        entry = _entry('Fe2O3', -1, _MP_GGA_FE_O)
+        self.assertIsNone(self.compat.process_entry(entry))
+        self.assertIsNotNone(self.ggacompat.process_entry(entry))
+
+        #Check actual corrections
+        cases = [
+            ("Fe2O3 GGA+U",
+             'Fe2O3', -1, _MP_GGA_U_FE_O, _MP_FE2O3_CORR),
+            ("FeF3 GGA+U",
+             'FeF3', -2, dict(_MP_GGA_U_FE_O, hubbards={'Fe': 5.3, 'F': 0},
+                              potcar_symbols=_PSP_FE_PV_F), -2.733)]
+        for label, formula, energy, params, correction in cases:
+            entry = _entry(formula, energy, params)
+            processed = self.compat.process_entry(entry)
+            self.assertIsNotNone(processed, label)
+            self.assertAlmostEqual(processed.correction, correction, msg=label)
+
+        cases = [
+            ("Wrong U value",
+             'Fe2O3', -1, dict(_MP_GGA_U_FE_O, hubbards={'Fe': 5.2, 'O': 0})),
+            ("GGA run of U",
+             'Fe2O3', -1, dict(_MP_GGA_FE_O, hubbards=None)),
+            ("GGA+U run of non-U",
+             'Al2O3', -1, dict(_MP_GGA_U_FE_O, hubbards={'Al': 5.3, 'O': 0},
+                               potcar_symbols=_PSP_AL_O)),
+            ("Materials project should not have a U for sulfides",
+             'FeS2', -2, dict(_MP_GGA_U_FE_O, hubbards={'Fe': 5.3, 'S': 0},
+                              potcar_symbols=_PSP_FE_PV_S)),
+            ("Wrong psp",
+             'Fe2O3', -1, dict(_MP_GGA_U_FE_O, potcar_symbols=_PSP_FE_O))]
+        for label, formula, energy, params in cases:
+            entry = _entry(formula, energy, params)
+            self.assertIsNone(self.compat.process_entry(entry), label)
 
         #Testing processing of elements.
-        entry = ComputedEntry(
-            'O', -1, 0.0,
-            parameters={'is_hubbard': False, 'hubbards': {},
-                        'potcar_symbols': ['PAW_PBE O 08Apr2002'],
-                        'run_type': 'GGA'})
-        entry = compat.process_entry(entry)
+        entry = _entry('O', -1, _GGA_O)
+        entry = self.compat.process_entry(entry)
 #        self.assertEqual(entry.entry_id, -8)
         self.assertAlmostEqual(entry.energy, -1)
-        self.assertAlmostEqual(ggacompat.process_entry(entry).energy,
+        self.assertAlmostEqual(self.ggacompat.process_entry(entry).energy,
                                -1)
 
     def test_get_corrections_dict(self):
-        compat = MaterialsProjectCompatibility()
-        ggacompat = MaterialsProjectCompatibility("GGA")
-
         #Correct parameters
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True, 'hubbards': {'Fe': 5.3, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        c = compat.get_corrections_dict(entry)
+        entry = _entry('Fe2O3', -1)
+        c = self.compat.get_corrections_dict(entry)
 
         self.assertAlmostEqual(c["MP Gas Correction"], -2.10687)
         self.assertAlmostEqual(c["MP Advanced Correction"], -5.466)
 
         entry.parameters["is_hubbard"] = False
         del entry.parameters["hubbards"]
-        c = ggacompat.get_corrections_dict(entry)
+        c = self.ggacompat.get_corrections_dict(entry)
         self.assertNotIn("MP Advanced Correction", c)
 
     def test_process_entries(self):
-        compat = MaterialsProjectCompatibility()
-        entries = compat.process_entries([self.entry1, self.entry2,
-                                          self.entry3])
+        entries = self.compat.process_entries([self.entry1, self.entry2,
+                                               self.entry3])
         self.assertEqual(len(entries), 2)
 
 
 class MITCompatibilityTest(unittest.TestCase):
 
-    def test_process_entry(self):
-        compat = MITCompatibility()
+    _multiprocess_can_split_ = True
 
-        #Correct parameters
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True,
-                        'hubbards': {'Fe': 4.0, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNotNone(compat.process_entry(entry))
-        self.assertAlmostEqual(compat.process_entry(entry).correction,
-                               - 1.723 * 2 -0.66975*3)
-
-        entry = ComputedEntry(
-            'FeF3', -2, 0.0,
-            parameters={'is_hubbard': True,
-                        'hubbards': {'Fe': 4.0, 'F': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe 06Sep2000',
-                                           'PAW_PBE F 08Apr2002']})
-        self.assertIsNotNone(compat.process_entry(entry))
-
-        #Check actual correction
-        self.assertAlmostEqual(compat.process_entry(entry).correction, -1.723)
-
-        #MIT should not have a U for sulfides
-        entry = ComputedEntry(
-            'FeS2', -2, 0.0,
-            parameters={'is_hubbard': True,
-                        'hubbards': {'Fe': 1.9, 'S': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe 06Sep2000',
-                                           'PAW_PBE S 08Apr2002']})
-        self.assertIsNotNone(compat.process_entry(entry))
-
-        self.assertAlmostEqual(compat.process_entry(entry).correction, -1.113)
-
-        #Wrong U value
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True,
-                        'hubbards': {'Fe': 5.2, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-
-        #GGA run
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': False,
-                        'hubbards': None,
-                        'run_type': 'GGA',
-                        'potcar_symbols': ['PAW_PBE Fe 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
-
-        #Wrong psp
-        entry = ComputedEntry(
-            'Fe2O3', -1, 0.0,
-            parameters={'is_hubbard': True,
-                        'hubbards': {'Fe': 4.0, 'O': 0},
-                        'run_type': 'GGA+U',
-                        'potcar_symbols': ['PAW_PBE Fe_pv 06Sep2000',
-                                           'PAW_PBE O 08Apr2002']})
-        self.assertIsNone(compat.process_entry(entry))
+    @classmethod
+    def setUpClass(cls):
+        cls.compat = MITCompatibility()
+
+    def test_process_entry(self):
+        #Correct parameters and actual corrections
+        cases = [
+            ("Fe2O3 GGA+U",
+             'Fe2O3', -1, _MIT_GGA_U_FE_O, _MIT_FE2O3_CORR),
+            ("FeF3 GGA+U",
+             'FeF3', -2, dict(_MIT_GGA_U_FE_O, hubbards={'Fe': 4.0, 'F': 0},
+                              potcar_symbols=_PSP_FE_F), -1.723),
+            ("FeS2 GGA+U",
+             'FeS2', -2, dict(_MIT_GGA_U_FE_O, hubbards={'Fe': 1.9, 'S': 0},
+                              potcar_symbols=_PSP_FE_S), -1.113)]
+        for label, formula, energy, params, correction in cases:
+            entry = _entry(formula, energy, params)
+            processed = self.compat.process_entry(entry)
+            self.assertIsNotNone(processed, label)
+            self.assertAlmostEqual(processed.correction, correction, msg=label)
+
+        cases = [
+            ("Wrong U value",
+             'Fe2O3', -1, dict(_MIT_GGA_U_FE_O, hubbards={'Fe': 5.2, 'O': 0})),
+            ("GGA run",
+             'Fe2O3', -1, _MIT_GGA_FE_O),
+            ("Wrong psp",
+             'Fe2O3', -1, dict(_MIT_GGA_U_FE_O, potcar_symbols=_PSP_FE_PV_O))]
+        for label, formula, energy, params in cases:
+            entry = _entry(formula, energy, params)
+            self.assertIsNone(self.compat.process_entry(entry), label)
 
         #Testing processing of elements.
-        entry = ComputedEntry(
-            'O', -1, 0.0,
-            parameters={'is_hubbard': False, 'hubbards': {},
-                        'potcar_symbols': ['PAW_PBE O 08Apr2002'],
-                        'run_type': 'GGA'})
-        entry = compat.process_entry(entry)
+        entry = _entry('O', -1, _GGA_O)
+        entry = self.compat.process_entry(entry)
         self.assertAlmostEqual(entry.energy, -1)
 
 
-class OxideTypeCorrectionTest(unittest.TestCase):
-
-    def setUp(self):
-        self.compat = MITCompatibility()
+class _OxideStructsMixin(object):
+    """
+    Li-O structures and helpers shared by the oxide type correction tests.
+    The structures are built once, when the class is defined.
+    """
+
+    lio2_struct = Structure(
+        Lattice([[3.985034, 0.0, 0.0],
+                 [0.0, 4.881506, 0.0],
+                 [0.0, 0.0, 2.959824]]),
+        _ELTS_LIO2,
+        [[0.500000, 0.500000, 0.500000],
+         [0.0, 0.0, 0.0],
+         [0.632568, 0.085090, 0.500000],
+         [0.367432, 0.914910, 0.500000],
+         [0.132568, 0.414910, 0.000000],
+         [0.867432, 0.585090, 0.000000]])
+
+    li2o2_struct = Structure(
+        Lattice.from_parameters(3.159597, 3.159572, 7.685205,
+                                89.999884, 89.999674, 60.000510),
+        _ELTS_LI2O2,
+        [[0.666656, 0.666705, 0.750001],
+         [0.333342, 0.333378, 0.250001],
+         [0.000001, 0.000041, 0.500001],
+         [0.000001, 0.000021, 0.000001],
+         [0.333347, 0.333332, 0.649191],
+         [0.333322, 0.333353, 0.850803],
+         [0.666666, 0.666686, 0.350813],
+         [0.666665, 0.666684, 0.149189]])
+
+    lio3_struct = Structure(
+        Lattice.from_parameters(3.999911, 3.999911, 3.999911,
+                                133.847504, 102.228244, 95.477342),
+        _ELTS_LIO3,
+        [[0.513004, 0.513004, 1.000000],
+         [0.017616, 0.017616, 0.000000],
+         [0.649993, 0.874790, 0.775203],
+         [0.099587, 0.874790, 0.224797]])
+
+    li2o_struct = Structure(
+        Lattice.from_parameters(3.278, 3.278, 3.278, 60, 60, 60),
+        _ELTS_LI2O,
+        [[0.25, 0.25, 0.25],
+         [0.75, 0.75, 0.75],
+         [0.0, 0.0, 0.0]])
+
+    def process_struct(self, structure):
+        """
+        Returns the structure entry, with an energy of -3 eV, processed by
+        the compatibility scheme of the test case.
+        """
+        entry = ComputedStructureEntry(structure, -3,
+                                       parameters=dict(_MIT_GGA_FE_O))
+        return self.compat.process_entry(entry)
+
+
+class OxideTypeCorrectionTest(_OxideStructsMixin, unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compat = MITCompatibility()
 
     def test_no_struct_compat(self):
-        lio2_entry_nostruct = ComputedEntry(Composition("Li2O4"), -3,
+        lio2_entry_nostruct = ComputedEntry(_comp("Li2O4"), -3,
                                             data={"oxide_type": "superoxide"},
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
+                                            parameters=dict(_MIT_GGA_FE_O))
         lio2_entry_corrected = self.compat.process_entry(lio2_entry_nostruct)
-        self.assertAlmostEqual(lio2_entry_corrected.energy, -3 - 0.13893*4, 4)
+        self.assertAlmostEqual(lio2_entry_corrected.energy, _LIO2_ENERGY, 4)
 
     def test_process_entry_superoxide(self):
-        el_li = Element("Li")
-        el_o = Element("O")
-        latt = Lattice([[3.985034, 0.0, 0.0],
-                        [0.0, 4.881506, 0.0],
-                        [0.0, 0.0, 2.959824]])
-        elts = [el_li, el_li, el_o, el_o, el_o, el_o]
-        coords = list()
-        coords.append([0.500000, 0.500000, 0.500000])
-        coords.append([0.0, 0.0, 0.0])
-        coords.append([0.632568, 0.085090, 0.500000])
-        coords.append([0.367432, 0.914910, 0.500000])
-        coords.append([0.132568, 0.414910, 0.000000])
-        coords.append([0.867432, 0.585090, 0.000000])
-        struct = Structure(latt, elts, coords)
-        lio2_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        lio2_entry_corrected = self.compat.process_entry(lio2_entry)
-        self.assertAlmostEqual(lio2_entry_corrected.energy, -3 -0.13893*4, 4)
+        lio2_entry_corrected = self.process_struct(self.lio2_struct)
+        self.assertAlmostEqual(lio2_entry_corrected.energy, _LIO2_ENERGY, 4)
 
     def test_process_entry_peroxide(self):
-        latt = Lattice.from_parameters(3.159597, 3.159572, 7.685205, 89.999884, 89.999674, 60.000510)
-        el_li = Element("Li")
-        el_o = Element("O")
-        elts = [el_li, el_li, el_li, el_li, el_o, el_o, el_o, el_o]
-        coords = [[0.666656, 0.666705, 0.750001],
-                  [0.333342, 0.333378, 0.250001],
-                  [0.000001, 0.000041, 0.500001],
-                  [0.000001, 0.000021, 0.000001],
-                  [0.333347, 0.333332, 0.649191],
-                  [0.333322, 0.333353, 0.850803],
-                  [0.666666, 0.666686, 0.350813],
-                  [0.666665, 0.666684, 0.149189]]
-        struct = Structure(latt, elts, coords)
-        li2o2_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        li2o2_entry_corrected = self.compat.process_entry(li2o2_entry)
-        self.assertAlmostEqual(li2o2_entry_corrected.energy, -3 - 0.44317 * 4, 4)
+        li2o2_entry_corrected = self.process_struct(self.li2o2_struct)
+        self.assertAlmostEqual(li2o2_entry_corrected.energy, _LI2O2_ENERGY, 4)
 
     def test_process_entry_ozonide(self):
-        el_li = Element("Li")
-        el_o = Element("O")
-        elts = [el_li, el_o, el_o, el_o]
-        latt = Lattice.from_parameters(3.999911, 3.999911, 3.999911,
-                                       133.847504, 102.228244, 95.477342)
-        coords = [[0.513004, 0.513004, 1.000000],
-                  [0.017616, 0.017616, 0.000000],
-                  [0.649993, 0.874790, 0.775203],
-                  [0.099587, 0.874790, 0.224797]]
-        struct = Structure(latt, elts, coords)
-        lio3_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        lio3_entry_corrected = self.compat.process_entry(lio3_entry)
+        lio3_entry_corrected = self.process_struct(self.lio3_struct)
         self.assertAlmostEqual(lio3_entry_corrected.energy, -3.0)
 
     def test_process_entry_oxide(self):
-        el_li = Element("Li")
-        el_o = Element("O")
-        elts = [el_li, el_li, el_o]
-        latt = Lattice.from_parameters(3.278, 3.278, 3.278,
-                                       60, 60, 60)
-        coords = [[0.25, 0.25, 0.25],
-                  [0.75, 0.75, 0.75],
-                  [0.0, 0.0, 0.0]]
-        struct = Structure(latt, elts, coords)
-        li2o_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        li2o_entry_corrected = self.compat.process_entry(li2o_entry)
-        self.assertAlmostEqual(li2o_entry_corrected.energy, -3.0 -0.66975, 4)
-
-
-class OxideTypeCorrectionNoPeroxideCorrTest(unittest.TestCase):
-
-    def setUp(self):
-        self.compat = MITCompatibility(correct_peroxide=False)
+        li2o_entry_corrected = self.process_struct(self.li2o_struct)
+        self.assertAlmostEqual(li2o_entry_corrected.energy, _LI2O_ENERGY, 4)
+
+
+class OxideTypeCorrectionNoPeroxideCorrTest(_OxideStructsMixin,
+                                            unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compat = MITCompatibility(correct_peroxide=False)
 
     def test_oxide_energy_corr(self):
-        el_li = Element("Li")
-        el_o = Element("O")
-        elts = [el_li, el_li, el_o]
-        latt = Lattice.from_parameters(3.278, 3.278, 3.278,
-                                       60, 60, 60)
-        coords = [[0.25, 0.25, 0.25],
-                  [0.75, 0.75, 0.75],
-                  [0.0, 0.0, 0.0]]
-        struct = Structure(latt, elts, coords)
-        li2o_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        li2o_entry_corrected = self.compat.process_entry(li2o_entry)
-        self.assertAlmostEqual(li2o_entry_corrected.energy, -3.0 -0.66975, 4)
+        li2o_entry_corrected = self.process_struct(self.li2o_struct)
+        self.assertAlmostEqual(li2o_entry_corrected.energy, _LI2O_ENERGY, 4)
 
     def test_peroxide_energy_corr(self):
-        latt = Lattice.from_parameters(3.159597, 3.159572, 7.685205, 89.999884, 89.999674, 60.000510)
-        el_li = Element("Li")
-        el_o = Element("O")
-        elts = [el_li, el_li, el_li, el_li, el_o, el_o, el_o, el_o]
-        coords = [[0.666656, 0.666705, 0.750001],
-                  [0.333342, 0.333378, 0.250001],
-                  [0.000001, 0.000041, 0.500001],
-                  [0.000001, 0.000021, 0.000001],
-                  [0.333347, 0.333332, 0.649191],
-                  [0.333322, 0.333353, 0.850803],
-                  [0.666666, 0.666686, 0.350813],
-                  [0.666665, 0.666684, 0.149189]]
-        struct = Structure(latt, elts, coords)
-        li2o2_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        li2o2_entry_corrected = self.compat.process_entry(li2o2_entry)
-        self.assertRaises(AssertionError, self.assertAlmostEqual,
-                           *(li2o2_entry_corrected.energy, -3 - 0.44317 * 4, 4))
-        self.assertAlmostEqual(li2o2_entry_corrected.energy, -3 - 0.66975 * 4, 4)
+        li2o2_entry_corrected = self.process_struct(self.li2o2_struct)
+        self.assertNotAlmostEqual(li2o2_entry_corrected.energy,
+                                  _LI2O2_ENERGY, 4)
+        self.assertAlmostEqual(li2o2_entry_corrected.energy,
+                               _LI2O2_OXIDE_ENERGY, 4)
 
     def test_ozonide(self):
-        el_li = Element("Li")
-        el_o = Element("O")
-        elts = [el_li, el_o, el_o, el_o]
-        latt = Lattice.from_parameters(3.999911, 3.999911, 3.999911,
-                                       133.847504, 102.228244, 95.477342)
-        coords = [[0.513004, 0.513004, 1.000000],
-                  [0.017616, 0.017616, 0.000000],
-                  [0.649993, 0.874790, 0.775203],
-                  [0.099587, 0.874790, 0.224797]]
-        struct = Structure(latt, elts, coords)
-        lio3_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 06Sep2000', 'PAW_PBE O 08Apr2002']})
-        lio3_entry_corrected = self.compat.process_entry(lio3_entry)
-        self.assertAlmostEqual(lio3_entry_corrected.energy, -3.0 - 3 * 0.66975)
+        lio3_entry_corrected = self.process_struct(self.lio3_struct)
+        self.assertAlmostEqual(lio3_entry_corrected.energy, _LIO3_OXIDE_ENERGY)
 
 
 class AqueousCorrectionTest(unittest.TestCase):
 
-    def setUp(self):
-        module_dir = os.path.dirname(os.path.abspath(__file__))
-        fp = os.path.join(module_dir, os.path.pardir, "MITCompatibility.yaml")
-        self.corr = AqueousCorrection(fp)
+    _multiprocess_can_split_ = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corr = AqueousCorrection(_MIT_YAML)
 
     def test_compound_energy(self):
 
-        O2_entry = self.corr.correct_entry(ComputedEntry(Composition("O2"),
+        O2_entry = self.corr.correct_entry(ComputedEntry(_comp("O2"),
                                                           -4.9355 * 2))
-        H2_entry = self.corr.correct_entry(ComputedEntry(Composition("H2"), 3))
-        H2O_entry = self.corr.correct_entry(ComputedEntry(Composition("H2O"), 3))
+        H2_entry = self.corr.correct_entry(ComputedEntry(_comp("H2"), 3))
+        H2O_entry = self.corr.correct_entry(ComputedEntry(_comp("H2O"), 3))
         H2O_formation_energy = H2O_entry.energy - (H2_entry.energy +
                                                     O2_entry.energy / 2.0)
         self.assertAlmostEqual(H2O_formation_energy, -2.46, 2)
 
-        entry = ComputedEntry(Composition("H2O"), -16)
+        entry = ComputedEntry(_comp("H2O"), -16)
         entry = self.corr.correct_entry(entry)
         self.assertAlmostEqual(entry.energy, -14.916, 4)
 
-        entry = ComputedEntry(Composition("H2O"), -24)
+        entry = ComputedEntry(_comp("H2O"), -24)
         entry = self.corr.correct_entry(entry)
         self.assertAlmostEqual(entry.energy, -14.916, 4)
 
-        entry = ComputedEntry(Composition("Cl"), -24)
+        entry = ComputedEntry(_comp("Cl"), -24)
         entry = self.corr.correct_entry(entry)
         self.assertAlmostEqual(entry.energy, -24.344373, 4)
 
 
 class TestMITAqueousCompatibility(unittest.TestCase):
 
-    def setUp(self):
-        self.compat = MITCompatibility()
-        self.aqcompat = MITAqueousCompatibility()
-        module_dir = os.path.dirname(os.path.abspath(__file__))
-        fp = os.path.join(module_dir, os.path.pardir, "MITCompatibility.yaml")
-        self.aqcorr =  AqueousCorrection(fp)
+    _multiprocess_can_split_ = True
 
-    def test_aqueous_compat(self):
+    @classmethod
+    def setUpClass(cls):
+        cls.compat = MITCompatibility()
+        cls.aqcompat = MITAqueousCompatibility()
+        cls.aqcorr = AqueousCorrection(_MIT_YAML)
 
-        el_li = Element("Li")
-        el_o = Element("O")
-        el_h = Element("H")
-        latt = Lattice.from_parameters(3.565276, 3.565276, 4.384277, 90.000000, 90.000000, 90.000000)
-        elts = [el_h, el_h, el_li, el_li, el_o, el_o]
-        coords = [[0.000000, 0.500000, 0.413969],
-                  [0.500000, 0.000000, 0.586031],
-                  [0.000000, 0.000000, 0.000000],
-                  [0.500000, 0.500000, 0.000000],
-                  [0.000000, 0.500000, 0.192672],
-                  [0.500000, 0.000000, 0.807328]]
-        struct = Structure(latt, elts, coords)
-        lioh_entry = ComputedStructureEntry(struct, -3,
-                                            parameters={'is_hubbard': False,
-                                          'hubbards': None,
-                                          'run_type': 'GGA',
-                                          'potcar_symbols':
-        ['PAW_PBE Fe 17Jan2003', 'PAW_PBE O 08Apr2002', 'PAW_PBE H 15Jun2001']})
+    def test_aqueous_compat(self):
+        lioh_entry = ComputedStructureEntry(
+            _LIOH_STRUCT, -3,
+            parameters=dict(_MIT_GGA_FE_O, potcar_symbols=_PSP_FE_O_H))
         lioh_entry_compat = self.compat.process_entry(lioh_entry)
         lioh_entry_compat_aqcorr = self.aqcorr.correct_entry(lioh_entry_compat)
         lioh_entry_aqcompat = self.aqcompat.process_entry(lioh_entry)
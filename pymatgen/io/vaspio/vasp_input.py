@@ -906,9 +906,9 @@ class Kpoints(PMGSONable):
         angles = latt.angles
         hex_angle_tol = 5  # in degrees
         hex_length_tol = 0.01  # in angstroms
-        right_angles = [i for i in xrange(3)
+        right_angles = [i for i in range(3)
                         if abs(angles[i] - 90) < hex_angle_tol]
-        hex_angles = [i for i in xrange(3)
+        hex_angles = [i for i in range(3)
                       if abs(angles[i] - 60) < hex_angle_tol or
                       abs(angles[i] - 120) < hex_angle_tol]
 